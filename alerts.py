@@ -0,0 +1,236 @@
+import json
+import os
+from bisect import bisect_left
+from pathlib import Path
+
+# Listing fields a rule can pin to an exact value, e.g. {"Casing": "brass"}.
+# "Limits": "N/A" means the retailer has no purchase limit.
+MATCH_FIELDS = ["Brand", "Casing", "New?", "Limits", "Retailer"]
+
+# Listing fields a rule can cap, e.g. {"$/round": 0.25}. The first one a rule
+# sets is the one it is indexed under; the rest are checked on match.
+THRESHOLD_FIELDS = ["$/round", "Price"]
+
+ANY_CALIBER = "*"
+
+RULE_FIELDS = ["name", "caliber"] + MATCH_FIELDS + THRESHOLD_FIELDS
+
+
+def load_rules(rules_file="watchlist.json"):
+    """
+    Loads saved watchlist rules, returning an empty list if there are none.
+
+    Rules without a unique name, with a non-numeric threshold or with an
+    unknown field (e.g. a typo'd "price") are skipped with a warning rather
+    than failing the whole check or matching every listing.
+    """
+    if not Path(rules_file).exists():
+        return []
+    with open(rules_file, "r") as f:
+        saved_rules = json.load(f).get("rules", [])
+
+    rules = []
+    names = set()
+    for position, rule in enumerate(saved_rules):
+        name = rule.get("name") if isinstance(rule, dict) else None
+        if not isinstance(name, str) or not name:
+            print(
+                f"Warning: Watchlist rule #{position + 1} has no name. Skipping rule."
+            )
+            continue
+        if name in names:
+            print(f"Warning: Duplicate watchlist rule name '{name}'. Skipping rule.")
+            continue
+        unknown_fields = [field for field in rule if field not in RULE_FIELDS]
+        if unknown_fields:
+            print(
+                f"Warning: Watchlist rule '{name}' has unknown field(s) "
+                f"{', '.join(unknown_fields)}. Skipping rule."
+            )
+            continue
+        bad_fields = [
+            field
+            for field in THRESHOLD_FIELDS
+            if field in rule
+            and (
+                not isinstance(rule[field], (int, float))
+                or isinstance(rule[field], bool)
+            )
+        ]
+        if bad_fields:
+            print(
+                f"Warning: Watchlist rule '{name}' has a non-numeric "
+                f"{', '.join(bad_fields)} threshold. Skipping rule."
+            )
+            continue
+        names.add(name)
+        rules.append(rule)
+    return rules
+
+
+def _normalize(value):
+    return value.casefold() if isinstance(value, str) else value
+
+
+class AlertIndex:
+    """
+    Indexes watchlist rules by caliber slug and price threshold.
+
+    Each caliber gets one bucket per threshold field holding the rules indexed
+    under it, sorted by threshold. A listing only looks at the rules whose
+    threshold it is at or below (found with a binary search), plus the rules
+    that have no threshold at all, instead of every saved rule.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.buckets = {}
+        for rule_index, rule in enumerate(rules):
+            caliber = rule.get("caliber", ANY_CALIBER)
+            field = next((f for f in THRESHOLD_FIELDS if f in rule), None)
+            threshold = rule[field] if field else None
+            caliber_buckets = self.buckets.setdefault(caliber, {})
+            caliber_buckets.setdefault(field, []).append((threshold, rule_index))
+
+        for caliber_buckets in self.buckets.values():
+            for field, entries in caliber_buckets.items():
+                if field is not None:
+                    entries.sort()
+                caliber_buckets[field] = (
+                    [threshold for threshold, _ in entries],
+                    [rule_index for _, rule_index in entries],
+                )
+
+    def candidates(self, caliber, listing):
+        """Yields the indexes of the rules a listing could possibly satisfy."""
+        for key in (caliber, ANY_CALIBER):
+            caliber_buckets = self.buckets.get(key)
+            if not caliber_buckets:
+                continue
+            for field, (thresholds, rule_indexes) in caliber_buckets.items():
+                if field is None:
+                    yield from rule_indexes
+                    continue
+                value = listing.get(field)
+                if value is None:
+                    continue
+                yield from rule_indexes[bisect_left(thresholds, value) :]
+
+    def matches(self, caliber, listing):
+        """Returns the rules a listing satisfies."""
+        matched = []
+        for rule_index in self.candidates(caliber, listing):
+            rule = self.rules[rule_index]
+            if self._satisfies(rule, listing):
+                matched.append(rule)
+        return matched
+
+    @staticmethod
+    def _satisfies(rule, listing):
+        for field in MATCH_FIELDS:
+            if field in rule and _normalize(listing.get(field)) != _normalize(
+                rule[field]
+            ):
+                return False
+        for field in THRESHOLD_FIELDS:
+            if field in rule:
+                value = listing.get(field)
+                if value is None or value > rule[field]:
+                    return False
+        return True
+
+
+def alert_key(rule, listing):
+    """
+    Identifies a listing firing a rule across runs.
+
+    Listing IDs are regenerated on every parse, so the share link and the
+    prices are used instead; a price change fires the rule again.
+    """
+    return "|".join(
+        str(part)
+        for part in (
+            rule["name"],
+            listing.get("Link"),
+            listing.get("Price"),
+            listing.get("$/round"),
+        )
+    )
+
+
+def check_alerts(
+    snapshot,
+    rules_file="watchlist.json",
+    outbox_file="alerts_outbox.jsonl",
+    state_file="alert_state.json",
+):
+    """
+    Matches a parsed snapshot against the watchlist and writes new alerts.
+
+    Args:
+        snapshot (dict): Caliber slug (calibers.json name) to list of parsed listings.
+        rules_file (str): Watchlist rules file.
+        outbox_file (str): JSON lines file new alerts are appended to.
+        state_file (str): Alerts seen on the last run, per caliber, used for dedup.
+
+    Returns:
+        list: The alerts written to the outbox on this run.
+    """
+    rules = load_rules(rules_file)
+    if not rules:
+        return []
+    index = AlertIndex(rules)
+
+    state = {}
+    if Path(state_file).exists():
+        with open(state_file, "r") as f:
+            state = json.load(f)
+
+    new_alerts = []
+    for caliber, listings in snapshot.items():
+        previous_keys = set(state.get(caliber, []))
+        current_keys = set()
+        for listing in listings:
+            for rule in index.matches(caliber, listing):
+                key = alert_key(rule, listing)
+                if key in current_keys:
+                    continue
+                current_keys.add(key)
+                if key not in previous_keys:
+                    new_alerts.append(
+                        {"rule": rule["name"], "caliber": caliber, **listing}
+                    )
+        # Only the calibers in this snapshot are replaced, so a single parsed
+        # file doesn't reset the dedup state of every other caliber.
+        state[caliber] = sorted(current_keys)
+
+    if new_alerts:
+        with open(outbox_file, "a") as outfile:
+            for alert in new_alerts:
+                outfile.write(json.dumps(alert) + "\n")
+    with open(state_file, "w") as f:
+        json.dump(state, f)
+
+    return new_alerts
+
+
+def load_snapshot(output_dir="output"):
+    """Reads every parsed output file into a caliber slug -> listings snapshot."""
+    snapshot = {}
+    for filename in os.listdir(output_dir):
+        if filename.endswith(".output.json"):
+            with open(os.path.join(output_dir, filename), "r") as infile:
+                snapshot[filename[: -len(".output.json")]] = json.load(infile).get(
+                    "results", []
+                )
+    return snapshot
+
+
+if __name__ == "__main__":
+    alerts = check_alerts(load_snapshot())
+    for alert in alerts:
+        print(
+            f"[{alert['rule']}] {alert['caliber']}: {alert['Description']} "
+            f"at {alert['Retailer']} - ${alert['$/round']}/rd ({alert['Link']})"
+        )
+    print(f"Alert check complete. {len(alerts)} new alert(s).")
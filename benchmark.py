@@ -0,0 +1,346 @@
+import argparse
+import contextlib
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent
+
+# Pages picked by size from the committed data/ fixtures: the smallest, one
+# near the median (~300 KB) and the largest.
+PARSE_PAGES = {
+    "small": "45-hp.json",
+    "medium": "45-special.json",
+    "large": "300-hamr.json",
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name, number, repeat=5):
+    """
+    Registers a benchmark. The decorated function sets up and returns the timed operation.
+
+    The operation is timed ``repeat`` times over ``number`` calls each, and the
+    best round is kept so one noisy round doesn't read as a regression.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, number, repeat)
+        return setup
+
+    return register
+
+
+def read_page(filename):
+    with open(REPO_DIR / "data" / filename, "r") as infile:
+        return json.load(infile)["results"][0]["content"]
+
+
+def run_script(script):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        runpy.run_path(str(REPO_DIR / script), run_name="__main__")
+
+
+def import_main():
+    # Outside a Streamlit session every cached call logs "missing
+    # ScriptRunContext" warnings, which would bury the results.
+    import streamlit.logger
+
+    streamlit.logger.set_log_level("error")
+    import main
+
+    return main
+
+
+def make_parse_benchmark(size, filename, number):
+    @benchmark(f"parse_ammoseek_html[{size}]", number=number)
+    def setup(workdir):
+        import parser
+
+        html_content = read_page(filename)
+        id_file = workdir / "id_tracker.json"
+
+        def parse():
+            # parse_ammoseek_html saves every new ID through the module-level
+            # IDManager, so each call starts from an empty one to keep its cost
+            # independent of how many calls ran before it.
+            if id_file.exists():
+                os.remove(id_file)
+            parser.id_manager = parser.IDManager(str(id_file))
+            parser.parse_ammoseek_html(html_content)
+
+        return parse
+
+
+make_parse_benchmark("small", PARSE_PAGES["small"], number=20)
+make_parse_benchmark("medium", PARSE_PAGES["medium"], number=5)
+make_parse_benchmark("large", PARSE_PAGES["large"], number=2)
+
+
+# The full data/ directory takes minutes to parse, so the batch runs over a
+# fixed slice of it (always including the pages above).
+BATCH_PAGES = 20
+
+
+@benchmark(f"parser.py batch[{BATCH_PAGES} pages]", number=1, repeat=3)
+def setup_parser_batch(workdir):
+    filenames = sorted(os.listdir(REPO_DIR / "data"))
+    batch = set(PARSE_PAGES.values())
+    batch.update(filenames[: BATCH_PAGES - len(batch)])
+    os.makedirs(workdir / "data")
+    for filename in batch:
+        os.symlink(REPO_DIR / "data" / filename, workdir / "data" / filename)
+
+    def parse_batch():
+        # Start every run without the IDs the previous one saved.
+        if os.path.exists("id_tracker.json"):
+            os.remove("id_tracker.json")
+        run_script("parser.py")
+
+    return parse_batch
+
+
+def link_combine_inputs(workdir):
+    for name in ("output", "calibers.json"):
+        os.symlink(REPO_DIR / name, workdir / name)
+
+
+@benchmark("combine.py", number=1)
+def setup_combine(workdir):
+    link_combine_inputs(workdir)
+    return lambda: run_script("combine.py")
+
+
+@benchmark("IDManager.generate_unique_id", number=1, repeat=3)
+def setup_id_manager(workdir):
+    from parser import IDManager
+
+    # Start from roughly one full parse worth of IDs, like id_tracker.json does.
+    id_file = workdir / "bench_ids.json"
+    seed_ids = [str(10000000 + i) for i in range(18000)]
+
+    def generate_ids():
+        with open(id_file, "w") as f:
+            json.dump({"ids": seed_ids}, f)
+        id_manager = IDManager(str(id_file))
+        for _ in range(500):
+            id_manager.generate_unique_id()
+
+    return generate_ids
+
+
+def combined_listings(workdir):
+    filepath = workdir / "all_calibers.json"
+    if not filepath.exists():
+        link_combine_inputs(workdir)
+        run_script("combine.py")
+    return str(filepath)
+
+
+@benchmark("main.read_listings", number=3)
+def setup_main_load(workdir):
+    main = import_main()
+
+    filepath = combined_listings(workdir)
+    return lambda: main.read_listings(filepath)
+
+
+@benchmark("main.load_calibers[3 shards]", number=20)
+def setup_main_load_shards(workdir):
+    main = import_main()
+
+    combined_listings(workdir)
+    catalog = main.load_catalog(os.path.getmtime(main.CATALOG_FILE))
+    selected_calibers = list(catalog)[:3]
+
+    def load_uncached():
+        main.load_shard.clear()
+        main.load_calibers(catalog, selected_calibers)
+
+    return load_uncached
+
+
+@benchmark("main.filter_listings", number=50)
+def setup_main_filter(workdir):
+    main = import_main()
+
+    df = main.read_listings(combined_listings(workdir))
+    brand = df["Brand"].mode()[0]
+    price_min, price_max, round_price_min, round_price_max = main.price_bounds(
+        df, brand
+    )
+
+    def filter_and_bound():
+        main.price_bounds(df, brand)
+        main.filter_listings(
+            df,
+            brand,
+            "All Descriptions",
+            (price_min, price_max),
+            (round_price_min, round_price_max),
+        )
+
+    return filter_and_bound
+
+
+@benchmark("main.summarize_listings", number=100)
+def setup_main_summarize(workdir):
+    main = import_main()
+
+    df = main.read_listings(combined_listings(workdir))
+    return lambda: main.summarize_listings(df)
+
+
+def run_benchmark(setup, number, repeat, workdir):
+    """
+    Times a benchmark, then runs it once more under tracemalloc for peak memory.
+
+    Returns:
+        dict: ops/sec and seconds per op of the best round, the median seconds
+        per op across rounds, and peak traced memory in bytes.
+    """
+    os.makedirs(workdir)
+    os.chdir(workdir)
+    operation = setup(workdir)
+    operation()  # warm up imports and caches
+
+    rounds = sorted(
+        elapsed / number
+        for elapsed in timeit.repeat(operation, repeat=repeat, number=number)
+    )
+
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": 1 / rounds[0],
+        "sec_per_op": rounds[0],
+        "median_sec_per_op": rounds[len(rounds) // 2],
+        "peak_memory_bytes": peak,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Returns a message for every benchmark slower or bigger than the baseline allows."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if result["ops_per_sec"] < expected["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.2f} ops/sec vs baseline "
+                f"{expected['ops_per_sec']:.2f} ops/sec"
+            )
+        if result["peak_memory_bytes"] > expected["peak_memory_bytes"] * (
+            1 + tolerance
+        ):
+            regressions.append(
+                f"{name}: {result['peak_memory_bytes'] / 1e6:.1f} MB peak vs baseline "
+                f"{expected['peak_memory_bytes'] / 1e6:.1f} MB peak"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Benchmark the parser, combine and dashboard hot paths."
+    )
+    arg_parser.add_argument(
+        "-k", "--only", help="Only run benchmarks whose name contains this text"
+    )
+    arg_parser.add_argument("--output", default="benchmark_results.json")
+    arg_parser.add_argument("--baseline", default="benchmark_baseline.json")
+    arg_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown or memory growth against the baseline (0.25 = 25%%)",
+    )
+    arg_parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the new baseline",
+    )
+    arg_parser.add_argument(
+        "--require-baseline",
+        action="store_true",
+        help="Fail instead of warning when there is no baseline to compare against",
+    )
+    args = arg_parser.parse_args()
+
+    output_path = Path(args.output).resolve()
+    baseline_path = Path(args.baseline).resolve()
+
+    # The scripts read and write relative to the working directory (including
+    # id_tracker.json), so each benchmark runs in its own scratch directory.
+    workdir = Path(tempfile.mkdtemp(prefix="ammo-bench-"))
+    sys.path.insert(0, str(REPO_DIR))
+
+    results = {}
+    try:
+        for index, (name, (setup, number, repeat)) in enumerate(BENCHMARKS.items()):
+            if args.only and args.only not in name:
+                continue
+            print(f"Running {name}...", flush=True)
+            results[name] = run_benchmark(setup, number, repeat, workdir / str(index))
+            print(
+                f"  {results[name]['ops_per_sec']:.2f} ops/sec, "
+                f"{results[name]['sec_per_op'] * 1000:.1f} ms/op, "
+                f"{results[name]['peak_memory_bytes'] / 1e6:.1f} MB peak"
+            )
+    finally:
+        os.chdir(REPO_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(output_path, "w") as outfile:
+        json.dump(results, outfile, indent=4)
+    print(f"Benchmark results saved to '{output_path}'")
+
+    if args.save_baseline:
+        # Only this run's benchmarks are replaced, so saving a -k selection
+        # keeps the baseline of everything that wasn't run.
+        baseline = {}
+        if baseline_path.exists():
+            with open(baseline_path, "r") as infile:
+                baseline = json.load(infile)
+        baseline.update(results)
+        with open(baseline_path, "w") as outfile:
+            json.dump(baseline, outfile, indent=4)
+        print(f"Baseline for {len(results)} benchmark(s) saved to '{baseline_path}'")
+    elif baseline_path.exists():
+        with open(baseline_path, "r") as infile:
+            baseline = json.load(infile)
+        missing = [name for name in results if name not in baseline]
+        if missing:
+            print(f"WARNING: No baseline entry for {len(missing)} benchmark(s):")
+            for name in missing:
+                print(f"  {name}")
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("PERFORMANCE REGRESSION:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        if missing and args.require_baseline:
+            sys.exit(1)
+        print(
+            f"No regressions against baseline for {len(results) - len(missing)} "
+            "benchmark(s)."
+        )
+    else:
+        print(
+            f"WARNING: No baseline at '{baseline_path}', nothing was compared. "
+            "Run with --save-baseline to store one."
+        )
+        if args.require_baseline:
+            sys.exit(1)
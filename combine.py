@@ -1,12 +1,94 @@
 import json
 import os
 
+from alerts import check_alerts
+
+
+def summarize_shard(results):
+    """Row count and price bounds of one caliber's listings, for the catalog index."""
+    prices = [item["Price"] for item in results if item.get("Price") is not None]
+    round_prices = [
+        item["$/round"] for item in results if item.get("$/round") is not None
+    ]
+    return {
+        "rows": len(results),
+        "price_min": min(prices, default=None),
+        "price_max": max(prices, default=None),
+        "round_price_min": min(round_prices, default=None),
+        "round_price_max": max(round_prices, default=None),
+    }
+
+
+def write_json_atomically(filepath, data):
+    """Writes JSON to a temp file and swaps it in, so readers never see half a file."""
+    temp_filepath = f"{filepath}.tmp"
+    with open(temp_filepath, "w") as outfile:
+        json.dump(data, outfile, indent=4)
+    os.replace(temp_filepath, filepath)
+
+
+def write_caliber_shards(snapshot, shard_dir="shards", calibers_file="calibers.json"):
+    """
+    Writes one file per caliber plus a catalog index the dashboard loads from.
+
+    Args:
+        snapshot (dict): Caliber slug (calibers.json name) to list of parsed listings.
+        shard_dir (str): Directory the shards and index.json are written to.
+        calibers_file (str): Caliber list used to order the catalog. Calibers are
+            sorted by name if it can't be read.
+
+    Returns:
+        dict: The catalog index, caliber slug to shard file, row count and price bounds.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+
+    try:
+        with open(calibers_file, "r") as f:
+            caliber_order = {
+                slug: position for position, slug in enumerate(json.load(f))
+            }
+    except (FileNotFoundError, json.JSONDecodeError):
+        print(f"Warning: Could not read '{calibers_file}'. Ordering calibers by name.")
+        caliber_order = {}
+    slugs = sorted(
+        snapshot, key=lambda slug: (caliber_order.get(slug, len(caliber_order)), slug)
+    )
+
+    catalog = {}
+    for slug in slugs:
+        results = snapshot[slug]
+        if not results:
+            continue
+        shard_filename = f"{slug}.json"
+        write_json_atomically(
+            os.path.join(shard_dir, shard_filename), {"results": results}
+        )
+        catalog[slug] = {"file": shard_filename, **summarize_shard(results)}
+
+    write_json_atomically(os.path.join(shard_dir, "index.json"), {"calibers": catalog})
+
+    # Drop shards of calibers that are now empty or gone, so the directory only
+    # ever holds what the index lists. This happens after the new index is in
+    # place, so the dashboard only ever reads an index whose shards exist.
+    shard_files = {entry["file"] for entry in catalog.values()}
+    for filename in os.listdir(shard_dir):
+        if (
+            filename.endswith(".json")
+            and filename != "index.json"
+            and filename not in shard_files
+        ):
+            os.remove(os.path.join(shard_dir, filename))
+
+    return catalog
+
+
 if __name__ == "__main__":
     output_dir = "output"
     output_file_path_all_calibers = (
         "all_calibers.json"  # Output in root folder (current directory)
     )
     combined_results = []
+    snapshot = {}
 
     for filename in os.listdir(output_dir):
         if filename.endswith(".output.json"):
@@ -18,6 +100,9 @@ if __name__ == "__main__":
                         json_data["results"], list
                     ):
                         combined_results.extend(json_data["results"])
+                        snapshot[filename.replace(".output.json", "")] = json_data[
+                            "results"
+                        ]
                     else:
                         print(
                             f"Warning: 'results' key not found or not a list in '{filename}'. Skipping file content."
@@ -45,4 +130,20 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error saving combined data to '{output_file_path_all_calibers}': {e}")
 
+    try:
+        catalog = write_caliber_shards(snapshot)
+        print(f"Sharded data for {len(catalog)} calibers saved to 'shards'.")
+    except Exception as e:
+        print(f"Error saving caliber shards: {e}")
+
+    try:
+        new_alerts = check_alerts(snapshot)
+        print(f"{len(new_alerts)} new alert(s) written to 'alerts_outbox.jsonl'.")
+    except json.JSONDecodeError:
+        print(
+            "Error: Invalid JSON in 'watchlist.json' or 'alert_state.json'. Skipping alert check."
+        )
+    except Exception as e:
+        print(f"An error occurred while checking alerts: {e}. Skipping alert check.")
+
     print("Combining process complete.")
@@ -1,14 +1,19 @@
 import streamlit as st
 import json
+import os
 import pandas as pd
 import plotly.express as px
 
 st.set_page_config(page_title="Find Your Ammo!", page_icon="🎯", layout="wide")
 
+SHARD_DIR = "shards"
+CATALOG_FILE = os.path.join(SHARD_DIR, "index.json")
+# Caliber shards kept in memory at once; older ones are evicted past this.
+SHARD_CACHE_SIZE = 16
 
-@st.cache_data
-def load_and_preprocess_data():
-    with open("all_calibers.json", "r") as f:
+
+def read_listings(filepath="all_calibers.json"):
+    with open(filepath, "r") as f:
         data = json.load(f)
         df = pd.DataFrame(data["results"])
         for col in ["Price", "Rounds", "$/round"]:
@@ -16,11 +21,134 @@ def load_and_preprocess_data():
     return df
 
 
+# The catalog and shards are cached by file modification time as well, so a
+# running dashboard picks up whatever combine.py last wrote.
+@st.cache_data(max_entries=1)
+def load_catalog(catalog_mtime):
+    with open(CATALOG_FILE, "r") as f:
+        return json.load(f)["calibers"]
+
+
+@st.cache_data(max_entries=SHARD_CACHE_SIZE)
+def load_shard(caliber, shard_file, shard_mtime):
+    df = read_listings(os.path.join(SHARD_DIR, shard_file))
+    # The parsed Caliber is lossy (30-luger listings come out as "Luger"), so
+    # the calibers.json name the shard is keyed by is used instead.
+    df["Caliber"] = caliber
+    return df
+
+
+def load_calibers(catalog, selected_calibers):
+    return pd.concat(
+        [
+            load_shard(
+                caliber,
+                catalog[caliber]["file"],
+                os.path.getmtime(os.path.join(SHARD_DIR, catalog[caliber]["file"])),
+            )
+            for caliber in selected_calibers
+        ],
+        ignore_index=True,
+    )
+
+
+def caliber_label(catalog, caliber):
+    entry = catalog[caliber]
+    if entry["round_price_min"] is None:
+        return f"{caliber} ({entry['rows']} listings)"
+    return (
+        f"{caliber} ({entry['rows']} listings, "
+        f"${entry['round_price_min']:.3f}-${entry['round_price_max']:.3f}/rd)"
+    )
+
+
+def price_bounds(df, selected_brand):
+    if selected_brand == "All Brands":
+        price_min, price_max = int(df["Price"].min()), int(df["Price"].max())
+        round_price_min, round_price_max = (
+            df["$/round"].min(),
+            df["$/round"].max(),
+        )
+    else:
+        brand_df = df[df["Brand"] == selected_brand]
+        price_min, price_max = int(brand_df["Price"].min()), int(
+            brand_df["Price"].max()
+        )
+        round_price_min, round_price_max = (
+            brand_df["$/round"].min(),
+            brand_df["$/round"].max(),
+        )
+
+    if price_min == price_max:
+        price_max = price_min + 1
+    if round_price_min == round_price_max:
+        round_price_max = round_price_min + 0.001
+
+    return price_min, price_max, round_price_min, round_price_max
+
+
+def filter_listings(
+    df, selected_brand, selected_description, price_range, round_price_range
+):
+    filtered_df = df[
+        (df["Price"] >= price_range[0])
+        & (df["Price"] <= price_range[1])
+        & (df["$/round"] >= round_price_range[0])
+        & (df["$/round"] <= round_price_range[1])
+    ]
+
+    # Apply brand filter
+    if selected_brand != "All Brands":
+        filtered_df = filtered_df[filtered_df["Brand"] == selected_brand]
+
+    # Apply description filter
+    if selected_description != "All Descriptions":
+        filtered_df = filtered_df[filtered_df["Description"] == selected_description]
+
+    return filtered_df
+
+
+def summarize_listings(filtered_df):
+    return {
+        "listings": len(filtered_df),
+        "calibers": filtered_df["Caliber"].nunique(),
+        "avg_cost_per_round": filtered_df["$/round"].mean(),
+        "top_brand": filtered_df["Brand"].mode()[0] if not filtered_df.empty else "N/A",
+        "median_rounds": filtered_df["Rounds"].median(),
+        "brass_share": (filtered_df["Casing"] == "brass").mean(),
+        "brand_counts": filtered_df["Brand"].value_counts().head(10),
+    }
+
+
 def main():
     st.title("Find Ammos 🎯")
     st.markdown("### Your one-stop shop for the best ammo prices")
 
-    df = load_and_preprocess_data()
+    try:
+        catalog = load_catalog(os.path.getmtime(CATALOG_FILE))
+    except FileNotFoundError:
+        st.error("No caliber data found. Run combine.py to build it.")
+        return
+
+    selected_calibers = st.multiselect(
+        "Select Calibers:",
+        list(catalog),
+        default=list(catalog)[:1],
+        format_func=lambda caliber: caliber_label(catalog, caliber),
+        # More shards than the cache holds would be evicted and re-read from
+        # disk on every rerun.
+        max_selections=SHARD_CACHE_SIZE,
+        help=f"Pick up to {SHARD_CACHE_SIZE} calibers.",
+    )
+    if not selected_calibers:
+        st.info("Pick at least one caliber to see listings.")
+        return
+
+    try:
+        df = load_calibers(catalog, selected_calibers)
+    except FileNotFoundError:
+        st.warning("Caliber data is being rebuilt. Refresh in a moment.")
+        return
 
     with st.expander("Filter Options", expanded=True):
         col1, col2 = st.columns(2)
@@ -38,26 +166,9 @@ def main():
 
         col1, col2 = st.columns(2)
         with col1:
-            if selected_brand == "All Brands":
-                price_min, price_max = int(df["Price"].min()), int(df["Price"].max())
-                round_price_min, round_price_max = (
-                    df["$/round"].min(),
-                    df["$/round"].max(),
-                )
-            else:
-                brand_df = df[df["Brand"] == selected_brand]
-                price_min, price_max = int(brand_df["Price"].min()), int(
-                    brand_df["Price"].max()
-                )
-                round_price_min, round_price_max = (
-                    brand_df["$/round"].min(),
-                    brand_df["$/round"].max(),
-                )
-
-            if price_min == price_max:
-                price_max = price_min + 1
-            if round_price_min == round_price_max:
-                round_price_max = round_price_min + 0.001
+            price_min, price_max, round_price_min, round_price_max = price_bounds(
+                df, selected_brand
+            )
 
             price_range = st.slider(
                 "Price ($):",
@@ -76,37 +187,24 @@ def main():
             )
 
     # Apply filters
-    filtered_df = df[
-        (df["Price"] >= price_range[0])
-        & (df["Price"] <= price_range[1])
-        & (df["$/round"] >= round_price_range[0])
-        & (df["$/round"] <= round_price_range[1])
-    ]
-
-    # Apply brand filter
-    if selected_brand != "All Brands":
-        filtered_df = filtered_df[filtered_df["Brand"] == selected_brand]
-
-    # Apply description filter
-    if selected_description != "All Descriptions":
-        filtered_df = filtered_df[filtered_df["Description"] == selected_description]
+    filtered_df = filter_listings(
+        df, selected_brand, selected_description, price_range, round_price_range
+    )
+    summary = summarize_listings(filtered_df)
 
     col1, col2, col3, col4, col5, col6 = st.columns(6)
     with col1:
-        st.metric("🎯 Ammo Listings Found", len(filtered_df))
+        st.metric("🎯 Ammo Listings Found", summary["listings"])
     with col2:
-        st.metric("💥 Caliber Varieties", filtered_df["Caliber"].nunique())
+        st.metric("💥 Caliber Varieties", summary["calibers"])
     with col3:
-        st.metric("💸 Average Cost Per Shot", f'${filtered_df["$/round"].mean():.3f}')
+        st.metric("💸 Average Cost Per Shot", f'${summary["avg_cost_per_round"]:.3f}')
     with col4:
-        st.metric(
-            "🏆 Ammo King Brand",
-            filtered_df["Brand"].mode()[0] if not filtered_df.empty else "N/A",
-        )
+        st.metric("🏆 Ammo King Brand", summary["top_brand"])
     with col5:
-        st.metric("🎁 Average Rounds per Box", f'{filtered_df["Rounds"].median():.0f}')
+        st.metric("🎁 Average Rounds per Box", f'{summary["median_rounds"]:.0f}')
     with col6:
-        st.metric("✨ Brass %", f'{(filtered_df["Casing"]=="brass").mean()*100:.1f}%')
+        st.metric("✨ Brass %", f'{summary["brass_share"]*100:.1f}%')
 
     st.subheader("🔍 Find Your Perfect Match")
     st.dataframe(
@@ -138,7 +236,7 @@ def main():
     st.plotly_chart(fig)
 
     st.subheader("🏆 Top Brands Showdown")
-    brand_counts = filtered_df["Brand"].value_counts().head(10)
+    brand_counts = summary["brand_counts"]
     fig = px.pie(
         values=brand_counts.values,
         names=brand_counts.index,
@@ -5,6 +5,8 @@ import re
 import uuid
 from pathlib import Path
 
+from alerts import check_alerts
+
 
 # ID Management System
 class IDManager:
@@ -187,6 +189,7 @@ if __name__ == "__main__":
     if not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
 
+    snapshot = {}
     for filename in os.listdir(data_dir):
         if filename.endswith(".json"):
             input_filepath = os.path.join(data_dir, filename)
@@ -203,6 +206,7 @@ if __name__ == "__main__":
 
                 with open(output_filepath, "w") as outfile:
                     json.dump(parsed_data, outfile, indent=4)
+                snapshot[filename.replace(".json", "")] = parsed_data["results"]
                 print(f"Parsed data from '{filename}' and saved to '{output_filename}'")
 
             except json.JSONDecodeError:
@@ -214,4 +218,14 @@ if __name__ == "__main__":
             except Exception as e:
                 print(f"An error occurred while processing '{filename}': {e}")
 
+    try:
+        new_alerts = check_alerts(snapshot)
+        print(f"{len(new_alerts)} new alert(s) written to 'alerts_outbox.jsonl'.")
+    except json.JSONDecodeError:
+        print(
+            "Error: Invalid JSON in 'watchlist.json' or 'alert_state.json'. Skipping alert check."
+        )
+    except Exception as e:
+        print(f"An error occurred while checking alerts: {e}. Skipping alert check.")
+
     print("Parsing process complete.")